@@ -1,13 +1,19 @@
 import argparse
+import concurrent.futures
 import csv
+import io
 import logging
-from logging.handlers import RotatingFileHandler
+import mmap
+import multiprocessing
+from collections import deque
+from logging.handlers import MemoryHandler, RotatingFileHandler
 import os
 import re
+import subprocess
+import sys
 import threading
-import webbrowser
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Callable, Optional
 
@@ -23,23 +29,48 @@ try:
 except Exception:
     HAS_DND = False
 
+# Extraction de texte : PyMuPDF de préférence, pypdfium2 sinon ;
+# pypdf reste le dernier recours (pur Python, nettement plus lent)
+try:
+    import pymupdf
+    HAS_PYMUPDF = True
+except Exception:
+    HAS_PYMUPDF = False
+
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except Exception:
+    HAS_PDFIUM = False
+
+# Optional fast PDF writer (pikepdf/qpdf : copie les pages sans
+# re-sérialiser les ressources partagées, contrairement à PdfWriter)
+try:
+    import pikepdf
+    HAS_PIKEPDF = True
+except Exception:
+    HAS_PIKEPDF = False
+
 # ------------------- Naming rules (NEW) -------------------
 # Format demandé : ANNEE-mois-AVS.pdf  -> ex: 2026-janvier-756.1234.5678.97.pdf
 
-MONTHS_FR = {
-    "01": "janvier",
-    "02": "fevrier",
-    "03": "mars",
-    "04": "avril",
-    "05": "mai",
-    "06": "juin",
-    "07": "juillet",
-    "08": "aout",
-    "09": "septembre",
-    "10": "octobre",
-    "11": "novembre",
-    "12": "decembre",
-}
+# Tuple indexé par int(mois) : un simple déréférencement au lieu d'un
+# hachage de chaîne par page (l'index 0 reste vide)
+MONTHS_FR = (
+    "",
+    "janvier",
+    "fevrier",
+    "mars",
+    "avril",
+    "mai",
+    "juin",
+    "juillet",
+    "aout",
+    "septembre",
+    "octobre",
+    "novembre",
+    "decembre",
+)
 
 # Période : 12.2025
 PERIOD_RE = re.compile(r"Période\s*:\s*(\d{2})\.(\d{4})", re.UNICODE)
@@ -47,28 +78,58 @@ PERIOD_RE = re.compile(r"Période\s*:\s*(\d{2})\.(\d{4})", re.UNICODE)
 # AVS : 756.1234.5678.97
 AVS_RE = re.compile(r"\b\d{3}\.\d{4}\.\d{4}\.\d{2}\b")
 
+# Les deux motifs fusionnés : une seule passe finditer sur le texte au
+# lieu de deux search complets, avec arrêt dès que les deux ont matché
+HEADER_RE = re.compile(
+    r"Période\s*:\s*(?P<month>\d{2})\.(?P<year>\d{4})"
+    r"|(?P<avs>\b\d{3}\.\d{4}\.\d{4}\.\d{2}\b)",
+    re.UNICODE,
+)
 
-def extract_filename_year_month_avs(page_text: str) -> Optional[str]:
+
+def extract_year_month_avs(text: str) -> Optional[tuple[str, str, str]]:
     """
-    Retourne un filename au format: YYYY-mois-AVS.pdf
-    ou None si période/AVS non trouvés.
+    Retourne (year, mois_fr, avs) si la page contient un entête de fiche,
+    sinon None. Une seule passe regex par page : les composants sont
+    réutilisés tels quels pour le nom de fichier ET pour le Record.
+
+    Contrat : text est toujours une str (l'extraction normalise déjà
+    None -> "" une seule fois, côté _page_text).
     """
-    text = page_text or ""
+    # Préfiltre : la recherche de sous-chaîne C est bien plus rapide que
+    # le regex, et la plupart des pages de suite n'ont pas d'entête.
+    if "Période" not in text:
+        return None
 
-    m_per = PERIOD_RE.search(text)
-    if not m_per:
+    month_num = year = avs = None
+    for m in HEADER_RE.finditer(text):
+        if m.group("avs") is not None:
+            if avs is None:
+                avs = m.group("avs")
+        elif month_num is None:
+            month_num = m.group("month")
+            year = m.group("year")
+        if month_num is not None and avs is not None:
+            break
+
+    if month_num is None or avs is None:
         return None
-    month_num = m_per.group(1)
-    year = m_per.group(2)
-    month_name = MONTHS_FR.get(month_num)
-    if not month_name:
+    mi = int(month_num)
+    if not 1 <= mi <= 12:
         return None
 
-    m_avs = AVS_RE.search(text)
-    if not m_avs:
-        return None
-    avs = m_avs.group(0)
+    return year, MONTHS_FR[mi], avs
+
 
+def extract_filename_year_month_avs(page_text: str) -> Optional[str]:
+    """
+    Retourne un filename au format: YYYY-mois-AVS.pdf
+    ou None si période/AVS non trouvés.
+    """
+    header = extract_year_month_avs(page_text or "")
+    if not header:
+        return None
+    year, month_name, avs = header
     return f"{year}-{month_name}-{avs}.pdf"
 
 
@@ -93,26 +154,48 @@ def setup_logger(log_path: Path) -> logging.Logger:
     fh = RotatingFileHandler(log_path, maxBytes=2_000_000, backupCount=5, encoding="utf-8")
     fh.setLevel(logging.INFO)
     fh.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+    # Écriture fichier par blocs : un format+write par page sur le
+    # fichier de log pèse sur les gros PDF. flush_logger() vide le
+    # tampon en fin de run (et ERROR force un flush immédiat).
+    mh = MemoryHandler(capacity=1024, target=fh, flushLevel=logging.ERROR)
 
     logger.addHandler(ch)
-    logger.addHandler(fh)
+    logger.addHandler(mh)
     return logger
 
 
-def open_folder(path: Path):
+def flush_logger(logger: logging.Logger) -> None:
+    """Vide les handlers tamponnés (log fichier à jour en fin de run)."""
+    for h in logger.handlers:
+        h.flush()
+
+
+def _open_path(path: Path):
+    """
+    Ouvre un chemin avec l'application associée, détachée de l'app :
+    appel direct de l'ouvreur système (xdg-open/open) plutôt que
+    webbrowser.open, qui parcourt son registre de navigateurs et peut
+    forker plusieurs fois avant de trouver le bon.
+    """
     path = path.resolve()
-    if os.name == "nt":
+    if sys.platform == "win32":
         os.startfile(str(path))  # type: ignore[attr-defined]
-    else:
-        webbrowser.open(path.as_uri())
+        return
+    opener = "open" if sys.platform == "darwin" else "xdg-open"
+    subprocess.Popen(
+        [opener, str(path)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def open_folder(path: Path):
+    _open_path(path)
 
 
 def open_file(path: Path):
-    path = path.resolve()
-    if os.name == "nt":
-        os.startfile(str(path))  # type: ignore[attr-defined]
-    else:
-        webbrowser.open(path.as_uri())
+    _open_path(path)
 
 
 # ------------------- Project dirs (as requested) -------------------
@@ -141,17 +224,38 @@ def make_dirs(root: Path, timestamp: str):
 
 # ------------------- PDF writing helpers -------------------
 
-def write_pages(reader: PdfReader, page_indices: list[int], out_path: Path):
+def write_pages(pages, page_indices: list[int], out_path: Path, pike_src=None):
+    """
+    pages: liste pré-résolue de reader.pages (évite de re-résoudre
+    les objets indirects pypdf à chaque accès).
+    pike_src: pikepdf.Pdf source déjà ouvert ; si fourni, la copie de
+    pages passe par qpdf (pas de deep-copy des polices/images par fiche).
+    """
+    if pike_src is not None:
+        dst = pikepdf.Pdf.new()
+        for idx in page_indices:
+            dst.pages.append(pike_src.pages[idx])
+        # object streams compacts les sorties ; pas de linéarisation,
+        # inutile pour des fiches ouvertes en local
+        dst.save(
+            str(out_path),
+            linearize=False,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+        return
     writer = PdfWriter()
     for idx in page_indices:
-        writer.add_page(reader.pages[idx])
-    with open(out_path, "wb") as f:
-        writer.write(f)
+        writer.add_page(pages[idx])
+    # Assemblage en mémoire puis un seul write() disque, au lieu des
+    # nombreux petits write() que PdfWriter émet en streaming
+    buf = io.BytesIO()
+    writer.write(buf)
+    out_path.write_bytes(buf.getbuffer())
 
 
 # ------------------- Records + CSV -------------------
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     status: str                 # OK / FALLBACK / ERROR / ORPHAN
     year: str                   # YYYY or "-"
@@ -163,30 +267,304 @@ class Record:
     note: str                   # extra info
 
 
-def export_csv(records: list[Record], csv_path: Path):
-    csv_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f, delimiter=";")
-        w.writerow(["status", "year", "month", "avs", "pages", "output_file", "output_path", "note"])
-        for r in records:
-            w.writerow([r.status, r.year, r.month, r.avs, r.pages, r.output_file, r.output_path, r.note])
+class CsvRecordSink:
+    """
+    Écrit les Record dans le CSV au fil de l'eau, dès que leur statut
+    définitif est connu (phase d'écriture) : une seule passe sur les
+    enregistrements au lieu d'une ré-itération complète en fin de run.
+    """
+
+    def __init__(self, csv_path: Path):
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        # Gros buffer d'écriture : le CSV part en quelques flush au lieu
+        # d'un par bloc de 8 Ko
+        self._f = open(csv_path, "w", newline="", encoding="utf-8", buffering=1 << 20)
+        self._w = csv.writer(self._f, delimiter=";")
+        self._w.writerow(["status", "year", "month", "avs", "pages", "output_file", "output_path", "note"])
+
+    def __call__(self, r: Record) -> None:
+        self._w.writerow((r.status, r.year, r.month, r.avs, r.pages, r.output_file, r.output_path, r.note))
+
+    def close(self) -> None:
+        self._f.close()
+
 
+# ------------------- Text extraction (serial / prefetch) -------------------
 
-def parse_year_month_avs_from_filename(filename: str):
+DEFAULT_WORKERS = min(os.cpu_count() or 4, 8)
+
+
+def _open_text_doc(input_pdf: Path):
+    """Ouvre le PDF avec le meilleur backend d'extraction disponible."""
+    if HAS_PYMUPDF:
+        # mmap : les workers du pool mappent le même fichier et lisent
+        # via le cache de pages de l'OS au lieu de relire chacun le PDF
+        with open(input_pdf, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return pymupdf.open(stream=memoryview(mm), filetype="pdf")
+    if HAS_PDFIUM:
+        return pdfium.PdfDocument(str(input_pdf))
+    return PdfReader(str(input_pdf))
+
+
+def _doc_page_count(doc) -> int:
+    if HAS_PYMUPDF:
+        return doc.page_count
+    if HAS_PDFIUM:
+        return len(doc)
+    return len(doc.pages)
+
+
+def _page_text(doc, i: int) -> str:
+    if HAS_PYMUPDF:
+        return doc.load_page(i).get_text("text") or ""
+    if HAS_PDFIUM:
+        return doc[i].get_textpage().get_text_range() or ""
+    return doc.pages[i].extract_text() or ""
+
+
+def _close_doc(doc):
+    close = getattr(doc, "close", None)
+    if close is not None:
+        close()
+
+
+def _scan_page_header(page) -> Optional[tuple[str, str, str]]:
+    """
+    Équivalent de extract_year_month_avs sur une page PyMuPDF, mais par
+    blocs de texte avec arrêt anticipé : get_text("blocks") décode la
+    page entière dans tous les cas, mais préfiltre et regex s'arrêtent
+    dès que Période et AVS ont été trouvés au lieu de parcourir tout le
+    texte des pages longues ou chargées en graphiques.
+
+    Les pages sans couche texte (scans, logos pleine page) sont rejetées
+    d'emblée : sans opérateur BT dans le flux de contenu, aucun glyphe
+    n'est émis, inutile de décoder quoi que ce soit. Le raccourci ne
+    vaut que si la page ne référence aucun XObject : du texte dessiné
+    via un formulaire (/Do, typique des outils d'estampillage) n'a pas
+    de BT dans le flux de la page elle-même.
     """
-    filename attendu: YYYY-mois-AVS.pdf
-    retourne (year, month, avs) sinon ('-','-','-')
+    if not page.get_xobjects() and b"BT" not in page.read_contents():
+        return None
+    m_per = None
+    m_avs = None
+    for block in page.get_text("blocks"):
+        bt = block[4]
+        if not bt:
+            continue
+        if m_per is None and "Période" in bt:
+            m_per = PERIOD_RE.search(bt)
+        if m_avs is None:
+            m_avs = AVS_RE.search(bt)
+        if m_per is not None and m_avs is not None:
+            break
+    if m_avs is not None and m_per is None:
+        # Label "Période :" et valeur peuvent tomber dans deux blocs de
+        # mise en page distincts ; sur le texte intégral, le \s* du
+        # motif traverse le saut de ligne et recolle les deux (c'était
+        # le comportement du scan pleine page d'origine)
+        m_per = PERIOD_RE.search(page.get_text("text"))
+    if m_per is None or m_avs is None:
+        return None
+    mi = int(m_per.group(1))
+    if not 1 <= mi <= 12:
+        return None
+    return m_per.group(2), MONTHS_FR[mi], m_avs.group(0)
+
+
+def _page_header(doc, i: int) -> Optional[tuple[str, str, str]]:
+    """Entête (year, mois, avs) de la page i, ou None."""
+    if HAS_PYMUPDF:
+        return _scan_page_header(doc.load_page(i))
+    return extract_year_month_avs(_page_text(doc, i))
+
+
+def _outline_headers(pike_src, total_pages: int) -> Optional[list]:
+    """
+    Entêtes par page déduits des signets (outline) du PDF, sans aucune
+    extraction de texte : liste indexée par page avec l'entête sur la
+    page de début de chaque fiche et None sur les pages de suite.
+
+    Retourne None dès qu'un signet est absent ou inexploitable (titre
+    sans Période/AVS, destination invalide) : l'appelant retombe alors
+    sur le scan de texte normal.
     """
     try:
-        base = filename.replace(".pdf", "")
-        year, month, avs = base.split("-", 2)
-        return year, month, avs
+        with pike_src.open_outline() as outline:
+            items = list(outline.root)
     except Exception:
-        return "-", "-", "-"
+        return None
+    if not items:
+        return None
+
+    headers: list = [None] * total_pages
+    for item in items:
+        title = str(item.title or "")
+        m_per = PERIOD_RE.search(title)
+        m_avs = AVS_RE.search(title)
+        if m_per is None or m_avs is None:
+            return None
+        mi = int(m_per.group(1))
+        if not 1 <= mi <= 12:
+            return None
+        try:
+            dest = item.destination
+            if dest is None:
+                # Signet encodé en action /A GoTo (la forme la plus
+                # courante) plutôt qu'en /Dest : la page est dans /D[0]
+                action = item.action
+                if action is not None and action.get("/S") == pikepdf.Name.GoTo:
+                    dest = action.get("/D")
+            page_idx = pikepdf.Page(dest[0]).index
+        except Exception:
+            return None
+        if not 0 <= page_idx < total_pages:
+            return None
+        headers[page_idx] = (m_per.group(2), MONTHS_FR[mi], m_avs.group(0))
+    return headers
+
+
+# Cache par processus worker : document d'extraction ouvert une fois
+_WORKER_DOCS: dict = {}
+
+
+def _extract_chunk(args: tuple[str, int, int]) -> list:
+    """
+    Worker du pool de processus : entêtes des pages [start, end).
+
+    Une erreur d'extraction est renvoyée comme Exception dans la liste
+    (à re-lever côté appelant) pour garder la gestion page par page.
+    """
+    input_pdf, start, end = args
+    doc = _WORKER_DOCS.get(input_pdf)
+    if doc is None:
+        doc = _WORKER_DOCS[input_pdf] = _open_text_doc(Path(input_pdf))
+    out = []
+    for i in range(start, end):
+        try:
+            out.append(_page_header(doc, i))
+        except Exception as e:
+            out.append(e)
+    return out
+
+
+def _iter_page_headers(input_pdf: Path, doc, total_pages: int, workers: int):
+    """
+    Génère l'entête (ou None) de chaque page, dans l'ordre.
+
+    Avec workers > 1, l'extraction part par tranches de pages sur un
+    ProcessPoolExecutor pendant que l'appelant regroupe les fiches : le
+    chemin regex est du pur Python, des processus évitent donc toute
+    contention de GIL. Chaque processus rouvre le PDF une seule fois
+    (cache par processus).
+    """
+    if workers <= 1:
+        for i in range(total_pages):
+            try:
+                yield _page_header(doc, i)
+            except Exception as e:
+                yield e
+        return
+
+    chunk = max(2, total_pages // (4 * workers))
+    window = workers + 2
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as ex:
+        pending: deque = deque()
+        nxt = 0
+        while nxt < total_pages and len(pending) < window:
+            end = min(nxt + chunk, total_pages)
+            pending.append(ex.submit(_extract_chunk, (str(input_pdf), nxt, end)))
+            nxt = end
+        while pending:
+            results = pending.popleft().result()
+            if nxt < total_pages:
+                end = min(nxt + chunk, total_pages)
+                pending.append(ex.submit(_extract_chunk, (str(input_pdf), nxt, end)))
+                nxt = end
+            yield from results
 
 
 # ------------------- Core split logic (multi-pages + records) -------------------
 
+@dataclass
+class _WriteJob:
+    """Écriture différée d'une fiche : collectée pendant la phase de
+    scan, exécutée ensuite dans la phase d'écriture (séquentielle ou
+    multi-processus)."""
+    page_indices: list[int]
+    out_path: Path
+    record: Record
+    log_level: int
+    log_msg: str
+
+
+# Cache par processus worker : source PDF ouverte une fois par processus
+_WORKER_SOURCES: dict = {}
+
+
+def _write_job_worker(args: tuple[str, list[int], str]) -> None:
+    """
+    Exécuté dans un processus du pool : écrit une fiche.
+
+    Les readers pypdf/pikepdf ne se picklent pas, on passe donc le
+    chemin ; la source est rouverte au premier appel puis réutilisée
+    pour tous les jobs traités par ce processus.
+    """
+    input_pdf, page_indices, out_path = args
+    src = _WORKER_SOURCES.get(input_pdf)
+    if src is None:
+        if HAS_PIKEPDF:
+            src = ("pike", pikepdf.open(input_pdf))
+        else:
+            src = ("pypdf", list(PdfReader(input_pdf).pages))
+        _WORKER_SOURCES[input_pdf] = src
+    kind, handle = src
+    if kind == "pike":
+        write_pages(None, page_indices, Path(out_path), handle)
+    else:
+        write_pages(handle, page_indices, Path(out_path))
+
+
+def _run_write_jobs(jobs: list[_WriteJob], input_pdf: Path, pages, pike_src,
+                    logger: logging.Logger, workers: int,
+                    record_sink: Optional[Callable[[Record], None]] = None):
+    """
+    Phase d'écriture : exécute tous les _WriteJob collectés au scan.
+
+    Avec workers > 1, les écritures partent sur un ProcessPoolExecutor
+    (la sérialisation pypdf est pure-Python et garde le GIL). Les
+    enregistrements dont l'écriture a réussi sont poussés dans
+    record_sink au fil de l'eau. Retourne [(job, exception)] pour les
+    écritures en échec ; l'appelant décide du repli.
+    """
+    failed: list[tuple[_WriteJob, Exception]] = []
+    if workers > 1 and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [
+                ex.submit(_write_job_worker, (str(input_pdf), job.page_indices, str(job.out_path)))
+                for job in jobs
+            ]
+            for job, fut in zip(jobs, futures):
+                exc = fut.exception()
+                if exc is not None:
+                    failed.append((job, exc))
+                else:
+                    logger.log(job.log_level, job.log_msg)
+                    if record_sink is not None:
+                        record_sink(job.record)
+    else:
+        for job in jobs:
+            try:
+                write_pages(pages, job.page_indices, job.out_path, pike_src)
+            except Exception as e:
+                failed.append((job, e))
+            else:
+                logger.log(job.log_level, job.log_msg)
+                if record_sink is not None:
+                    record_sink(job.record)
+    return failed
+
+
 def split_pdf(
     input_pdf: Path,
     ok_dir: Path,
@@ -194,11 +572,47 @@ def split_pdf(
     logger: logging.Logger,
     group_multipage: bool = True,
     progress_cb: Optional[Callable[[int, int], None]] = None,
+    workers: int = DEFAULT_WORKERS,
+    use_outlines: bool = False,
+    record_sink: Optional[Callable[[Record], None]] = None,
 ):
-    reader = PdfReader(str(input_pdf))
-    total_pages = len(reader.pages)
+    # Écriture : pikepdf (qpdf) en priorité, ouvert une seule fois pour
+    # toutes les fiches ; pypdf uniquement en repli si pikepdf manque.
+    # Le parse pur-Python de PdfReader est alors évité entièrement.
+    if HAS_PIKEPDF:
+        pike_src = pikepdf.open(str(input_pdf))
+        pages = None
+        total_pages = len(pike_src.pages)
+    else:
+        pike_src = None
+        # Résolution unique des pages pypdf (chaque accès reader.pages[i]
+        # re-parcourt le graphe d'objets indirects)
+        pages = list(PdfReader(str(input_pdf)).pages)
+        total_pages = len(pages)
+
+    # Mode signets : bornes de fiches lues dans l'outline du PDF, sans
+    # extraction de texte du tout quand les signets sont exploitables
+    outline_headers = None
+    if use_outlines and pike_src is not None:
+        outline_headers = _outline_headers(pike_src, total_pages)
+
+    doc = None
+    if outline_headers is None:
+        # Extraction de texte : PyMuPDF/pdfium (beaucoup plus rapides que pypdf)
+        doc = _open_text_doc(input_pdf)
+        total_pages = _doc_page_count(doc)
+
+    # Répertoires résolus une seule fois : .resolve() coûte un stat()
+    # par appel, et les chemins enfants restent absolus par concaténation
+    ok_dir = ok_dir.resolve()
+    err_dir = err_dir.resolve()
 
     records: list[Record] = []
+    jobs: list[_WriteJob] = []
+    # Noms déjà attribués pendant ce run : test d'appartenance O(1) en
+    # mémoire, au lieu d'un stat() disque par fiche. Amorcé avec le
+    # contenu du dossier au cas où deux runs partagent le même timestamp.
+    planned: set[str] = set(os.listdir(ok_dir))
 
     logger.info(f"📄 Fichier: {input_pdf.name}")
     logger.info(f"📌 Pages: {total_pages}")
@@ -212,222 +626,284 @@ def split_pdf(
     errors = 0
     orphan_pages = 0
 
-    # ---- Mode 1: 1 page = 1 file
+    if outline_headers is not None:
+        logger.info("🔖 Signets exploitables: extraction de texte sautée")
+        header_iter = iter(outline_headers)
+    else:
+        if use_outlines:
+            logger.warning("🔖 Signets absents ou inexploitables: scan de texte classique")
+        header_iter = _iter_page_headers(input_pdf, doc, total_pages, workers)
+    # Au plus ~100 remontées de progression : un événement Tk par page
+    # sature la boucle d'événements sur les gros PDF
+    progress_step = max(1, total_pages // 100)
+
+    # ---- Phase 1 : scan (détection des bornes + préparation des jobs)
+
     if not group_multipage:
+        # Mode 1 page = 1 fiche
         for i in range(total_pages):
             page_no = i + 1
             try:
-                text = reader.pages[i].extract_text() or ""
-                filename = extract_filename_year_month_avs(text)
-
-                if filename:
+                header = next(header_iter)
+                if isinstance(header, Exception):
+                    raise header
+
+                if header:
+                    year, month, avs = header
+                    # Nom calculé une fois puis réutilisé partout :
+                    # out_path.name referait le split à chaque accès
+                    filename = f"{year}-{month}-{avs}.pdf"
+                    if filename in planned:
+                        filename = f"{filename[:-4]}_page{page_no:03d}.pdf"
+                    planned.add(filename)
                     out_path = ok_dir / filename
-                    if out_path.exists():
-                        out_path = ok_dir / f"{filename[:-4]}_page{page_no:03d}.pdf"
 
-                    write_pages(reader, [i], out_path)
                     ok_files += 1
-                    logger.info(f"✅ Page {page_no}/{total_pages} -> OK -> {out_path.name}")
-
-                    year, month, avs = parse_year_month_avs_from_filename(out_path.name)
-                    records.append(Record(
+                    record = Record(
                         status="OK",
                         year=year, month=month, avs=avs,
                         pages=f"{page_no}",
-                        output_file=out_path.name,
-                        output_path=str(out_path.resolve()),
+                        output_file=filename,
+                        output_path=str(out_path),
                         note="",
+                    )
+                    jobs.append(_WriteJob(
+                        [i], out_path, record, logging.INFO,
+                        f"✅ Page {page_no}/{total_pages} -> OK -> {filename}",
                     ))
                 else:
-                    out_path = err_dir / f"fiche_page_{page_no:03d}.pdf"
-                    write_pages(reader, [i], out_path)
+                    filename = f"fiche_page_{page_no:03d}.pdf"
+                    out_path = err_dir / filename
                     fallback_pages += 1
-                    logger.warning(f"⚠️ Page {page_no}: période/AVS non détectés -> errors -> {out_path.name}")
-
-                    records.append(Record(
+                    record = Record(
                         status="FALLBACK",
                         year="-", month="-", avs="-",
                         pages=f"{page_no}",
-                        output_file=out_path.name,
-                        output_path=str(out_path.resolve()),
+                        output_file=filename,
+                        output_path=str(out_path),
                         note="période/AVS non détectés",
+                    )
+                    jobs.append(_WriteJob(
+                        [i], out_path, record, logging.WARNING,
+                        f"⚠️ Page {page_no}: période/AVS non détectés -> errors -> {filename}",
                     ))
+                records.append(record)
 
             except Exception as e:
                 errors += 1
                 out_path = err_dir / f"error_page_{page_no:03d}.pdf"
-                try:
-                    write_pages(reader, [i], out_path)
-                    op = str(out_path.resolve())
-                    of = out_path.name
-                except Exception:
-                    op = "-"
-                    of = "-"
-                logger.error(f"❌ Page {page_no}: {type(e).__name__} - {e}")
-
-                records.append(Record(
+                record = Record(
                     status="ERROR",
                     year="-", month="-", avs="-",
                     pages=f"{page_no}",
-                    output_file=of,
-                    output_path=op,
+                    output_file=out_path.name,
+                    output_path=str(out_path),
                     note=f"{type(e).__name__}: {e}",
+                )
+                jobs.append(_WriteJob(
+                    [i], out_path, record, logging.ERROR,
+                    f"❌ Page {page_no}: {type(e).__name__} - {e}",
                 ))
+                records.append(record)
 
-            if progress_cb:
+            if progress_cb and (page_no % progress_step == 0 or page_no == total_pages):
                 progress_cb(page_no, total_pages)
 
-        return {
-            "pages": total_pages,
-            "ok_files": ok_files,
-            "fallback_pages": fallback_pages,
-            "errors": errors,
-            "orphans": orphan_pages,
-            "records": records
-        }
-
-    # ---- Mode 2: group multi-pages
-    current_pages: list[int] = []
-    current_filename: Optional[str] = None
-    current_start_page: Optional[int] = None
-
-    def flush_current():
-        nonlocal ok_files, fallback_pages, errors, current_pages, current_filename, current_start_page
-        if not current_pages:
-            return
+    else:
+        # Mode groupé : une fiche = page d'entête + pages de suite
+        current_pages: list[int] = []
+        current_filename: Optional[str] = None
+        current_header: Optional[tuple[str, str, str]] = None
+        current_start_page: Optional[int] = None
+        # Pages isolées consécutives (avant toute fiche) : regroupées en
+        # un seul PDF au lieu d'une écriture par page
+        orphan_run: list[int] = []
+
+        def flush_orphans():
+            nonlocal orphan_pages, fallback_pages
+            if not orphan_run:
+                return
+            start_no = orphan_run[0] + 1
+            end_no = orphan_run[-1] + 1
+            if len(orphan_run) == 1:
+                err_name = f"orphan_page_{start_no:03d}.pdf"
+                pages_str = f"{start_no}"
+                note = "page isolée avant toute fiche"
+                msg = f"⚠️ Page {start_no}: page isolée (pas de début fiche) -> errors -> {err_name}"
+            else:
+                err_name = f"orphan_block_p{start_no:03d}-{end_no:03d}.pdf"
+                pages_str = f"{start_no}-{end_no}"
+                note = "pages isolées avant toute fiche"
+                msg = f"⚠️ Pages {pages_str}: pages isolées (pas de début fiche) -> errors -> {err_name}"
+            out_err = err_dir / err_name
+            orphan_pages += len(orphan_run)
+            fallback_pages += len(orphan_run)
+            record = Record(
+                status="ORPHAN",
+                year="-", month="-", avs="-",
+                pages=pages_str,
+                output_file=err_name,
+                output_path=str(out_err),
+                note=note,
+            )
+            jobs.append(_WriteJob(
+                list(orphan_run), out_err, record, logging.WARNING, msg,
+            ))
+            records.append(record)
+            orphan_run.clear()
 
-        start_page = current_start_page if current_start_page else (current_pages[0] + 1)
-        end_page = current_pages[-1] + 1
-        pages_str = f"{start_page}-{end_page}" if start_page != end_page else f"{start_page}"
+        def flush_current():
+            nonlocal ok_files, fallback_pages, current_pages, current_filename, current_header, current_start_page
+            if not current_pages:
+                return
 
-        if current_filename:
-            out_path = ok_dir / current_filename
-            if out_path.exists():
-                out_path = ok_dir / f"{current_filename[:-4]}_p{start_page:03d}.pdf"
+            start_page = current_start_page if current_start_page else (current_pages[0] + 1)
+            end_page = current_pages[-1] + 1
+            pages_str = f"{start_page}-{end_page}" if start_page != end_page else f"{start_page}"
 
-            try:
-                write_pages(reader, current_pages, out_path)
-                ok_files += 1
-                logger.info(f"✅ Fiche pages {pages_str} -> OK -> {out_path.name}")
+            if current_filename:
+                filename = current_filename
+                if filename in planned:
+                    filename = f"{filename[:-4]}_p{start_page:03d}.pdf"
+                planned.add(filename)
+                out_path = ok_dir / filename
 
-                year, month, avs = parse_year_month_avs_from_filename(out_path.name)
-                records.append(Record(
+                ok_files += 1
+                year, month, avs = current_header if current_header else ("-", "-", "-")
+                record = Record(
                     status="OK",
                     year=year, month=month, avs=avs,
                     pages=pages_str,
-                    output_file=out_path.name,
-                    output_path=str(out_path.resolve()),
+                    output_file=filename,
+                    output_path=str(out_path),
                     note="",
+                )
+                jobs.append(_WriteJob(
+                    current_pages, out_path, record, logging.INFO,
+                    f"✅ Fiche pages {pages_str} -> OK -> {filename}",
                 ))
-            except Exception as e:
-                errors += 1
-                out_err = err_dir / f"error_slip_p{start_page:03d}.pdf"
-                try:
-                    write_pages(reader, current_pages, out_err)
-                    op = str(out_err.resolve())
-                    of = out_err.name
-                except Exception:
-                    op = "-"
-                    of = "-"
-                logger.error(f"❌ Fiche p{start_page:03d}: {type(e).__name__} - {e}")
-
-                records.append(Record(
-                    status="ERROR",
-                    year="-", month="-", avs="-",
-                    pages=pages_str,
-                    output_file=of,
-                    output_path=op,
-                    note=f"{type(e).__name__}: {e}",
-                ))
-        else:
-            out_err = err_dir / f"unknown_slip_p{start_page:03d}.pdf"
-            try:
-                write_pages(reader, current_pages, out_err)
+            else:
+                err_name = f"unknown_slip_p{start_page:03d}.pdf"
+                out_err = err_dir / err_name
                 fallback_pages += len(current_pages)
-                logger.warning(f"⚠️ Fiche pages {pages_str}: période/AVS non détectés -> errors -> {out_err.name}")
-
-                records.append(Record(
+                record = Record(
                     status="FALLBACK",
                     year="-", month="-", avs="-",
                     pages=pages_str,
-                    output_file=out_err.name,
-                    output_path=str(out_err.resolve()),
+                    output_file=err_name,
+                    output_path=str(out_err),
                     note="période/AVS non détectés",
+                )
+                jobs.append(_WriteJob(
+                    current_pages, out_err, record, logging.WARNING,
+                    f"⚠️ Fiche pages {pages_str}: période/AVS non détectés -> errors -> {err_name}",
                 ))
+            records.append(record)
+
+            current_pages = []
+            current_filename = None
+            current_header = None
+            current_start_page = None
+
+        for i in range(total_pages):
+            page_no = i + 1
+            try:
+                header = next(header_iter)
+                if isinstance(header, Exception):
+                    raise header
+
+                if header:
+                    # new slip starts -> flush previous
+                    flush_orphans()
+                    if current_pages:
+                        flush_current()
+                    current_pages = [i]
+                    current_header = header
+                    current_filename = f"{header[0]}-{header[1]}-{header[2]}.pdf"
+                    current_start_page = page_no
+                else:
+                    if current_pages:
+                        current_pages.append(i)
+                    else:
+                        # orphan page before any slip header
+                        orphan_run.append(i)
+
             except Exception as e:
+                # Une page en erreur coupe un éventuel bloc de pages
+                # isolées : sinon le bloc engloberait son numéro alors
+                # que la page part séparément dans error_page_NNN.pdf
+                flush_orphans()
                 errors += 1
-                logger.error(f"❌ Fiche inconnue p{start_page:03d}: {type(e).__name__} - {e}")
-                records.append(Record(
+                out_err = err_dir / f"error_page_{page_no:03d}.pdf"
+                record = Record(
                     status="ERROR",
                     year="-", month="-", avs="-",
-                    pages=pages_str,
-                    output_file="-",
-                    output_path="-",
+                    pages=f"{page_no}",
+                    output_file=out_err.name,
+                    output_path=str(out_err),
                     note=f"{type(e).__name__}: {e}",
+                )
+                jobs.append(_WriteJob(
+                    [i], out_err, record, logging.ERROR,
+                    f"❌ Page {page_no}: {type(e).__name__} - {e}",
                 ))
+                records.append(record)
 
-        current_pages = []
-        current_filename = None
-        current_start_page = None
-
-    for i in range(total_pages):
-        page_no = i + 1
-        try:
-            text = reader.pages[i].extract_text() or ""
-            filename = extract_filename_year_month_avs(text)
-
-            if filename:
-                # new slip starts -> flush previous
-                if current_pages:
-                    flush_current()
-                current_pages = [i]
-                current_filename = filename
-                current_start_page = page_no
-            else:
-                if current_pages:
-                    current_pages.append(i)
-                else:
-                    # orphan page before any slip header
-                    out_err = err_dir / f"orphan_page_{page_no:03d}.pdf"
-                    write_pages(reader, [i], out_err)
-                    orphan_pages += 1
-                    fallback_pages += 1
-                    logger.warning(f"⚠️ Page {page_no}: page isolée (pas de début fiche) -> errors -> {out_err.name}")
-
-                    records.append(Record(
-                        status="ORPHAN",
-                        year="-", month="-", avs="-",
-                        pages=f"{page_no}",
-                        output_file=out_err.name,
-                        output_path=str(out_err.resolve()),
-                        note="page isolée avant toute fiche",
-                    ))
+            if progress_cb and (page_no % progress_step == 0 or page_no == total_pages):
+                progress_cb(page_no, total_pages)
 
-        except Exception as e:
-            errors += 1
-            out_err = err_dir / f"error_page_{page_no:03d}.pdf"
+        flush_current()
+        flush_orphans()
+
+    # Ferme le générateur d'entêtes explicitement : après total_pages
+    # next(), il reste suspendu sur son dernier yield et son pool
+    # d'extraction (workers inactifs, documents ouverts) survivrait
+    # sinon à toute la phase d'écriture
+    close_iter = getattr(header_iter, "close", None)
+    if close_iter is not None:
+        close_iter()
+
+    if doc is not None:
+        _close_doc(doc)
+
+    # ---- Phase 2 : écriture (les bornes sont connues, parallélisable)
+    # Les lignes CSV partent au fil des écritures réussies ; les échecs
+    # (rares) sont poussés après leur repli, donc en fin de fichier.
+    failed = _run_write_jobs(jobs, input_pdf, pages, pike_src, logger, workers,
+                             record_sink)
+    for job, exc in failed:
+        record = job.record
+        start_page = job.page_indices[0] + 1
+        logger.error("❌ Fiche p%03d: %s - %s", start_page, type(exc).__name__, exc)
+
+        if record.status == "OK":
+            ok_files -= 1
+            # comportement historique : la fiche en échec part dans errors/
+            out_err = err_dir / f"error_slip_p{start_page:03d}.pdf"
             try:
-                write_pages(reader, [i], out_err)
-                op = str(out_err.resolve())
-                of = out_err.name
+                write_pages(pages, job.page_indices, out_err, pike_src)
+                record.output_file = out_err.name
+                record.output_path = str(out_err)
             except Exception:
-                op = "-"
-                of = "-"
-            logger.error(f"❌ Page {page_no}: {type(e).__name__} - {e}")
-
-            records.append(Record(
-                status="ERROR",
-                year="-", month="-", avs="-",
-                pages=f"{page_no}",
-                output_file=of,
-                output_path=op,
-                note=f"{type(e).__name__}: {e}",
-            ))
-
-        if progress_cb:
-            progress_cb(page_no, total_pages)
+                record.output_file = "-"
+                record.output_path = "-"
+        else:
+            if record.status == "FALLBACK":
+                fallback_pages -= len(job.page_indices)
+            elif record.status == "ORPHAN":
+                orphan_pages -= len(job.page_indices)
+                fallback_pages -= len(job.page_indices)
+            record.output_file = "-"
+            record.output_path = "-"
+        if record.status != "ERROR":
+            errors += 1
+        record.status = "ERROR"
+        record.note = f"{type(exc).__name__}: {exc}"
+        if record_sink is not None:
+            record_sink(record)
 
-    flush_current()
+    if pike_src is not None:
+        pike_src.close()
 
     logger.info("—" * 72)
     logger.info(f"📦 Fichiers OK: {ok_files}")
@@ -446,6 +922,7 @@ def split_pdf(
     }
 
 
+
 # ------------------- UI (professional) -------------------
 
 class AppUI(ttk.Frame):
@@ -642,7 +1119,7 @@ class AppUI(ttk.Frame):
 
     def _do_work(self, input_pdf: Path):
         try:
-            self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.timestamp = time.strftime("%Y%m%d_%H%M%S")
             ok_dir, err_dir, logs_dir = make_dirs(self.root, self.timestamp)
             self.ok_dir, self.err_dir = ok_dir, err_dir
             self.log_path = logs_dir / f"split_{self.timestamp}.log"
@@ -650,20 +1127,36 @@ class AppUI(ttk.Frame):
 
             logger = setup_logger(self.log_path)
 
+            # Débounce en plus du pas de ~1% côté split_pdf : jamais plus
+            # d'un événement Tk posté toutes les 50 ms
+            last_post = 0.0
+
             def progress_cb(done, total):
+                nonlocal last_post
+                now = time.monotonic()
+                if done < total and now - last_post < 0.05:
+                    return
+                last_post = now
                 self.master.after(0, lambda: self._update_progress(done, total))
 
-            result = split_pdf(
-                input_pdf=input_pdf,
-                ok_dir=ok_dir,
-                err_dir=err_dir,
-                logger=logger,
-                group_multipage=self.multipage_var.get(),
-                progress_cb=progress_cb,
-            )
+            csv_sink = CsvRecordSink(self.csv_path)
+            try:
+                result = split_pdf(
+                    input_pdf=input_pdf,
+                    ok_dir=ok_dir,
+                    err_dir=err_dir,
+                    logger=logger,
+                    group_multipage=self.multipage_var.get(),
+                    progress_cb=progress_cb,
+                    record_sink=csv_sink,
+                )
+            finally:
+                csv_sink.close()
+                # Dans finally : le log d'un run en échec doit être
+                # complet sur disque, pas tronqué dans le tampon
+                flush_logger(logger)
 
             self.records = result["records"]
-            export_csv(self.records, self.csv_path)
 
             self.master.after(0, lambda: self._finish(result))
         except Exception as e:
@@ -675,8 +1168,20 @@ class AppUI(ttk.Frame):
         self.status_var.set(f"Traitement… {done}/{total}")
 
     def _finish(self, result: dict):
-        for r in self.records:
-            self.tree.insert("", "end", values=(r.status, r.year, r.month, r.avs, r.pages, r.output_file, r.note))
+        # Tableau détaché pendant le remplissage : affiché, Tk re-dessine
+        # à chaque insert, ce qui bloque l'UI sur des centaines de lignes
+        rows = [
+            (r.status, r.year, r.month, r.avs, r.pages, r.output_file, r.note)
+            for r in self.records
+        ]
+        self.tree.grid_remove()
+        try:
+            # iid = index du record : open_selected retrouve le record en O(1)
+            insert = self.tree.insert
+            for i, row in enumerate(rows):
+                insert("", "end", iid=str(i), values=row)
+        finally:
+            self.tree.grid()
 
         self.run_btn.config(state="normal")
         self.open_output_btn.config(state="normal")
@@ -730,7 +1235,12 @@ class AppUI(ttk.Frame):
         )
         if not dest:
             return
-        export_csv(self.records, Path(dest))
+        sink = CsvRecordSink(Path(dest))
+        try:
+            for r in self.records:
+                sink(r)
+        finally:
+            sink.close()
         messagebox.showinfo("CSV exporté", f"CSV enregistré:\n{dest}")
 
     def open_selected(self):
@@ -738,11 +1248,10 @@ class AppUI(ttk.Frame):
         if not sel:
             messagebox.showinfo("Sélection", "Sélectionne une ligne dans le tableau.")
             return
-        values = self.tree.item(sel[0], "values")
-        filename = values[5]  # file column
-        pages = values[4]     # pages column
-
-        rec = next((r for r in self.records if r.output_file == filename and r.pages == pages), None)
+        try:
+            rec = self.records[int(sel[0])]
+        except (ValueError, IndexError):
+            rec = None
         if rec and rec.output_path != "-" and Path(rec.output_path).exists():
             open_file(Path(rec.output_path))
         else:
@@ -751,34 +1260,51 @@ class AppUI(ttk.Frame):
 
 # ------------------- CLI -------------------
 
-def run_cli(pdf_path: str, multipage: bool):
+def run_cli(pdf_path: str, multipage: bool, workers: int = DEFAULT_WORKERS,
+            use_outlines: bool = False):
     root = project_root()
     ensure_base_dirs(root)
 
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ts = time.strftime("%Y%m%d_%H%M%S")
     ok_dir, err_dir, logs_dir = make_dirs(root, ts)
     log_path = logs_dir / f"split_{ts}.log"
     csv_path = logs_dir / f"split_{ts}.csv"
 
     logger = setup_logger(log_path)
-    result = split_pdf(Path(pdf_path).expanduser().resolve(), ok_dir, err_dir, logger, group_multipage=multipage)
-    export_csv(result["records"], csv_path)
+    csv_sink = CsvRecordSink(csv_path)
+    try:
+        split_pdf(
+            Path(pdf_path).expanduser().resolve(),
+            ok_dir, err_dir, logger,
+            group_multipage=multipage,
+            workers=workers,
+            use_outlines=use_outlines,
+            record_sink=csv_sink,
+        )
+    finally:
+        csv_sink.close()
 
     logger.info(f"🧾 Log: {log_path}")
     logger.info(f"📄 CSV: {csv_path}")
+    flush_logger(logger)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Split fiches de salaire (UI si pas d'argument).")
     parser.add_argument("pdf", nargs="?", help="Chemin du PDF (sinon UI)")
     parser.add_argument("--no-multipage", action="store_true", help="Désactive le regroupement multi-pages")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Processus d'extraction/écriture (défaut: {DEFAULT_WORKERS}, 1 = séquentiel)")
+    parser.add_argument("--use-outlines", action="store_true",
+                        help="Bornes de fiches depuis les signets du PDF (sans extraction de texte)")
     args = parser.parse_args()
 
     root = project_root()
     ensure_base_dirs(root)
 
     if args.pdf:
-        run_cli(args.pdf, multipage=not args.no_multipage)
+        run_cli(args.pdf, multipage=not args.no_multipage, workers=args.workers,
+                use_outlines=args.use_outlines)
     else:
         if HAS_DND:
             try:
@@ -792,4 +1318,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Nécessaire pour le pool de processus dans l'exe PyInstaller
+    multiprocessing.freeze_support()
     main()